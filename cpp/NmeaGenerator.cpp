@@ -1,61 +1,165 @@
 // NmeaGenerator.cpp
 #include "NmeaGenerator.hpp"
 
+#include <algorithm>
+#include <array>
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <functional>
 #include <iomanip>
+#include <numeric>
 #include <sstream>
 
+namespace {
+
+// XOR of a fixed sentence fragment, evaluated at compile time
+constexpr uint8_t xorOf(std::string_view fragment)
+{
+    uint8_t result = 0;
+    for (char ch : fragment) {
+        result ^= static_cast<uint8_t>(ch);
+    }
+    return result;
+}
+
+constexpr SentenceTag makeTag(std::string_view text)
+{
+    return SentenceTag { text, xorOf(text) };
+}
+
+constexpr SentenceTag kGPGGATag = makeTag("GPGGA,");
+constexpr SentenceTag kGPRMCTag = makeTag("GPRMC,");
+constexpr SentenceTag kGPGLLTag = makeTag("GPGLL,");
+constexpr SentenceTag kGPGSATag = makeTag("GPGSA,");
+constexpr SentenceTag kGPGSVTag = makeTag("GPGSV,");
+constexpr SentenceTag kGLGSVTag = makeTag("GLGSV,");
+constexpr SentenceTag kGAGSVTag = makeTag("GAGSV,");
+constexpr SentenceTag kGBGSVTag = makeTag("GBGSV,");
+constexpr SentenceTag kGQZSVTag = makeTag("GQZSV,");
+constexpr SentenceTag kNFIMUTag = makeTag("NFIMU,");
+
+// Fixed-width GPGLL fields (ddmm.mmmm,N,dddmm.mmmm,E,hhmmss,A), patched in place per sentence
+constexpr std::string_view kGPGLLTemplate = "0000.0000,N,00000.0000,E,000000,A";
+constexpr size_t kGPGLLLatitudeOffset     = 0;
+constexpr size_t kGPGLLLatitudeWidth      = 9;
+constexpr size_t kGPGLLNsOffset           = 10;
+constexpr size_t kGPGLLLongitudeOffset    = 12;
+constexpr size_t kGPGLLLongitudeWidth     = 10;
+constexpr size_t kGPGLLEwOffset           = 23;
+constexpr size_t kGPGLLTimeOffset         = 25;
+constexpr size_t kGPGLLTimeWidth          = 6;
+
+// Uppercase hex digits for the checksum field
+constexpr char kHexDigits[] = "0123456789ABCDEF";
+
+// Enough room for a full batch of sentences without reallocating
+constexpr size_t kBatchCapacity = 2048;
+
+constexpr int64_t kSecondsPerDay = 24 * 60 * 60;
+
+// Constellations that get GSV sentences, in output order
+constexpr std::array<Constellation, 5> kGSVConstellations = {
+    Constellation::GPS,
+    Constellation::GLONASS,
+    Constellation::Galileo,
+    Constellation::Beidou,
+    Constellation::QZSS
+};
+
+// XOR checksum over raw sentence bytes, seeded with the XOR of any bytes not passed in
+inline uint8_t calculateChecksum(const char* data, size_t length, uint8_t seed = 0) noexcept
+{
+    // XOR eight bytes at a time, then fold the word down to a single byte
+    uint64_t word_checksum = seed;
+    size_t i               = 0;
+    for (; i + sizeof(uint64_t) <= length; i += sizeof(uint64_t)) {
+        uint64_t word;
+        std::memcpy(&word, data + i, sizeof(word));
+        word_checksum ^= word;
+    }
+    word_checksum ^= word_checksum >> 32;
+    word_checksum ^= word_checksum >> 16;
+    word_checksum ^= word_checksum >> 8;
+
+    // XOR the remaining tail bytes
+    return std::accumulate(data + i, data + length, static_cast<uint8_t>(word_checksum),
+                           std::bit_xor<>());
+}
+
+} // namespace
+
 // Constructor
 NmeaGenerator::NmeaGenerator()
     : rng_(std::random_device {}())
 {
 }
 
-// Checksum calculation
-std::string NmeaGenerator::calculateChecksum(const std::string& nmea_sentence) const
+// Start a sentence in the batch buffer, returning where its variable fields begin
+size_t NmeaGenerator::beginSentence(std::string& out, const SentenceTag& tag) const
+{
+    out += '$';
+    out += tag.text;
+    return out.size();
+}
+
+// Finish a sentence by checksumming its fields in place and appending "*hh\r\n"
+void NmeaGenerator::endSentence(std::string& out, size_t fields_start, const SentenceTag& tag) const
+{
+    uint8_t checksum = calculateChecksum(out.data() + fields_start, out.size() - fields_start, tag.checksum);
+    out += '*';
+    out += kHexDigits[checksum >> 4];
+    out += kHexDigits[checksum & 0x0F];
+    out += "\r\n";
+}
+
+// Next [0, 1) draw, refilling the whole pool in one pass when it runs out
+double NmeaGenerator::nextUnit()
 {
-    uint8_t checksum = 0;
-    for (char ch : nmea_sentence) {
-        checksum ^= static_cast<uint8_t>(ch);
+    if (unit_pool_pos_ == unit_pool_.size()) {
+        std::generate(unit_pool_.begin(), unit_pool_.end(), [this] { return unit_dist_(rng_); });
+        unit_pool_pos_ = 0;
     }
-    std::stringstream ss;
-    ss << std::uppercase << std::hex << std::setw(2) << std::setfill('0') << int(checksum);
-    return ss.str();
+    return unit_pool_[unit_pool_pos_++];
 }
 
-// Random uniform double
+// Random uniform double, scaled from a pooled [0, 1) draw
 double NmeaGenerator::randomUniform(double min, double max)
 {
-    std::uniform_real_distribution<double> dist(min, max);
-    return dist(rng_);
+    return min + (max - min) * nextUnit();
 }
 
-// Random integer
+// Random integer in [min, max], bucketed from a pooled [0, 1) draw
 int NmeaGenerator::randomInt(int min, int max)
 {
-    std::uniform_int_distribution<int> dist(min, max);
-    return dist(rng_);
+    int value = min + static_cast<int>(nextUnit() * (max - min + 1));
+    return std::min(value, max);
 }
 
-// Generate current UTC time string in HHMMSS format
-std::string NmeaGenerator::getUTCTime() const
+// Generate current UTC time (HHMMSS) and date (DDMMYY) strings from a single clock read.
+// The time of day is plain epoch arithmetic; gmtime_r only runs when the day changes
+UtcTimestamp NmeaGenerator::getUTCTimestamp()
 {
-    auto now        = std::chrono::system_clock::now();
-    std::time_t t_c = std::chrono::system_clock::to_time_t(now);
-    std::tm tm      = *std::gmtime(&t_c);
-    char utc_time[16];
-    std::strftime(utc_time, sizeof(utc_time), "%H%M%S", &tm);
-    return std::string(utc_time);
-}
+    auto since_epoch  = std::chrono::system_clock::now().time_since_epoch();
+    int64_t seconds   = std::chrono::duration_cast<std::chrono::seconds>(since_epoch).count();
+    int64_t day       = seconds / kSecondsPerDay;
+    int second_of_day = static_cast<int>(seconds % kSecondsPerDay);
+
+    if (day != cached_day_) {
+        std::time_t t_c = static_cast<std::time_t>(seconds);
+        std::tm tm;
+        gmtime_r(&t_c, &tm);
+        std::snprintf(cached_date_, sizeof(cached_date_), "%02u%02u%02u",
+                      static_cast<unsigned>(tm.tm_mday) % 100, static_cast<unsigned>(tm.tm_mon + 1) % 100,
+                      static_cast<unsigned>(tm.tm_year) % 100);
+        cached_day_ = day;
+    }
 
-// Generate current UTC date string in DDMMYY format
-std::string NmeaGenerator::getUTCDate() const
-{
-    auto now        = std::chrono::system_clock::now();
-    std::time_t t_c = std::chrono::system_clock::to_time_t(now);
-    std::tm tm      = *std::gmtime(&t_c);
-    char date_str[16];
-    std::strftime(date_str, sizeof(date_str), "%d%m%y", &tm);
-    return std::string(date_str);
+    UtcTimestamp utc;
+    std::snprintf(utc.time, sizeof(utc.time), "%02d%02d%02d", second_of_day / 3600,
+                  second_of_day / 60 % 60, second_of_day % 60);
+    std::memcpy(utc.date, cached_date_, sizeof(utc.date));
+    return utc;
 }
 
 // Generate shared location data
@@ -63,116 +167,128 @@ LocationData NmeaGenerator::generateLocation()
 {
     LocationData loc;
 
-    // Latitude: -90 to 90
+    // Latitude: -90 to 90, formatted once as ddmm.mmmm
     double latitude = randomUniform(-90.0, 90.0);
     loc.ns          = (latitude >= 0) ? 'N' : 'S';
     latitude        = std::abs(latitude);
     int lat_deg     = static_cast<int>(latitude);
     double lat_min  = (latitude - lat_deg) * 60.0;
-    std::ostringstream lat_ss;
-    lat_ss << std::setw(2) << std::setfill('0') << lat_deg << std::fixed << std::setprecision(4)
-           << lat_min;
-    loc.latitude = lat_ss.str();
+    char lat_str[32];
+    std::snprintf(lat_str, sizeof(lat_str), "%02d%07.4f", lat_deg, lat_min);
+    loc.latitude = lat_str;
 
-    // Longitude: -180 to 180
+    // Longitude: -180 to 180, formatted once as dddmm.mmmm
     double longitude = randomUniform(-180.0, 180.0);
     loc.ew           = (longitude >= 0) ? 'E' : 'W';
     longitude        = std::abs(longitude);
     int lon_deg      = static_cast<int>(longitude);
     double lon_min   = (longitude - lon_deg) * 60.0;
-    std::ostringstream lon_ss;
-    lon_ss << std::setw(3) << std::setfill('0') << lon_deg << std::fixed << std::setprecision(4)
-           << lon_min;
-    loc.longitude = lon_ss.str();
+    char lon_str[32];
+    std::snprintf(lon_str, sizeof(lon_str), "%03d%07.4f", lon_deg, lon_min);
+    loc.longitude = lon_str;
 
     return loc;
 }
 
+// Append count distinct satellites with PRNs drawn from [first_prn, last_prn]
+void NmeaGenerator::sampleSatellites(std::vector<SatelliteInfo>& satellites,
+                                     Constellation constellation,
+                                     int first_prn,
+                                     int last_prn,
+                                     int count)
+{
+    std::vector<int> prns(last_prn - first_prn + 1);
+    std::iota(prns.begin(), prns.end(), first_prn);
+
+    // Partial Fisher-Yates shuffle: only the first count slots are needed
+    int pool_size = static_cast<int>(prns.size());
+    count         = std::min(count, pool_size);
+    for (int i = 0; i < count; ++i) {
+        std::swap(prns[i], prns[randomInt(i, pool_size - 1)]);
+        satellites.push_back(SatelliteInfo { prns[i], constellation });
+    }
+}
+
 // Generate satellites with different constellations
 std::vector<SatelliteInfo> NmeaGenerator::generateSatellites()
 {
     std::vector<SatelliteInfo> satellites;
+    satellites.reserve(4 * 12 + 4); // Up to 12 each for four constellations, 4 for QZSS
 
     // GPS: PRN 1-32
-    for (int i = 0; i < randomInt(4, 12); ++i) {
-        satellites.push_back(SatelliteInfo { randomInt(1, 32), Constellation::GPS });
-    }
+    sampleSatellites(satellites, Constellation::GPS, 1, 32, randomInt(4, 12));
 
     // GLONASS: PRN 65-96
-    for (int i = 0; i < randomInt(4, 12); ++i) {
-        satellites.push_back(SatelliteInfo { randomInt(65, 96), Constellation::GLONASS });
-    }
+    sampleSatellites(satellites, Constellation::GLONASS, 65, 96, randomInt(4, 12));
 
     // Galileo: PRN 201-237
-    for (int i = 0; i < randomInt(4, 12); ++i) {
-        satellites.push_back(SatelliteInfo { randomInt(201, 237), Constellation::Galileo });
-    }
+    sampleSatellites(satellites, Constellation::Galileo, 201, 237, randomInt(4, 12));
 
     // Beidou: PRN 301-336
-    for (int i = 0; i < randomInt(4, 12); ++i) {
-        satellites.push_back(SatelliteInfo { randomInt(301, 336), Constellation::Beidou });
-    }
+    sampleSatellites(satellites, Constellation::Beidou, 301, 336, randomInt(4, 12));
 
     // QZSS: PRN 193-200
-    for (int i = 0; i < randomInt(1, 4); ++i) {
-        satellites.push_back(SatelliteInfo { randomInt(193, 200), Constellation::QZSS });
-    }
+    sampleSatellites(satellites, Constellation::QZSS, 193, 200, randomInt(1, 4));
 
     return satellites;
 }
 
 // Generate GPGGA sentence
-std::string NmeaGenerator::generateGPGGA(const LocationData& loc, int numSatellites)
+void NmeaGenerator::generateGPGGA(std::string& out, const UtcTimestamp& utc, const LocationData& loc, int numSatellites)
 {
-    std::string utc_time    = getUTCTime();
-    std::string fix_quality = std::to_string(randomInt(0, 5));
-    double horizontal_dil   = randomUniform(0.5, 2.5);
-    double altitude         = randomUniform(10.0, 100.0);
-    double geoid_sep        = randomUniform(-50.0, 50.0);
-
-    std::ostringstream gpgga_body;
-    gpgga_body << "GPGGA," << utc_time << "," << loc.latitude << "," << loc.ns << ","
-               << loc.longitude << "," << loc.ew << "," << fix_quality << "," << numSatellites
-               << "," << std::fixed << std::setprecision(1) << horizontal_dil << "," << altitude
-               << ",M," << geoid_sep << ",M,,,";
-    std::string checksum = calculateChecksum(gpgga_body.str());
-    return "$" + gpgga_body.str() + "*" + checksum + "\r\n";
+    int fix_quality       = randomInt(0, 5);
+    double horizontal_dil = randomUniform(0.5, 2.5);
+    double altitude       = randomUniform(10.0, 100.0);
+    double geoid_sep      = randomUniform(-50.0, 50.0);
+
+    // One format call over a fixed template instead of a stream insertion per field
+    char fields[128];
+    std::snprintf(fields, sizeof(fields), "%s,%s,%c,%s,%c,%d,%d,%.1f,%.1f,M,%.1f,M,,,", utc.time,
+                  loc.latitude.c_str(), loc.ns, loc.longitude.c_str(), loc.ew, fix_quality,
+                  numSatellites, horizontal_dil, altitude, geoid_sep);
+
+    size_t fields_start = beginSentence(out, kGPGGATag);
+    out += fields;
+    endSentence(out, fields_start, kGPGGATag);
 }
 
 // Generate GPRMC sentence
-std::string NmeaGenerator::generateGPRMC(const LocationData& loc)
+void NmeaGenerator::generateGPRMC(std::string& out, const UtcTimestamp& utc, const LocationData& loc)
 {
-    std::string utc_time      = getUTCTime();
-    std::string date_str      = getUTCDate();
-
     double speed_over_ground  = randomUniform(0, 100);
     double course_over_ground = randomUniform(0, 360);
 
-    std::ostringstream gprmc_body;
-    gprmc_body << "GPRMC," << utc_time << ",A," << loc.latitude << "," << loc.ns << ","
-               << loc.longitude << "," << loc.ew << "," << std::fixed << std::setprecision(1)
-               << speed_over_ground << "," << course_over_ground << "," << date_str << ",,,";
-    std::string checksum = calculateChecksum(gprmc_body.str());
-    return "$" + gprmc_body.str() + "*" + checksum + "\r\n";
+    char fields[128];
+    std::snprintf(fields, sizeof(fields), "%s,A,%s,%c,%s,%c,%.1f,%.1f,%s,,,", utc.time,
+                  loc.latitude.c_str(), loc.ns, loc.longitude.c_str(), loc.ew, speed_over_ground,
+                  course_over_ground, utc.date);
+
+    size_t fields_start = beginSentence(out, kGPRMCTag);
+    out += fields;
+    endSentence(out, fields_start, kGPRMCTag);
 }
 
 // Generate GPGLL sentence
-std::string NmeaGenerator::generateGPGLL(const LocationData& loc)
+void NmeaGenerator::generateGPGLL(std::string& out, const UtcTimestamp& utc, const LocationData& loc)
 {
-    std::string utc_time = getUTCTime();
-
-    std::ostringstream gpgll_body;
-    gpgll_body << "GPGLL," << loc.latitude << "," << loc.ns << "," << loc.longitude << "," << loc.ew
-               << "," << utc_time << ",A";
-    std::string checksum = calculateChecksum(gpgll_body.str());
-    return "$" + gpgll_body.str() + "*" + checksum + "\r\n";
+    // Every field has a fixed width, so copy the template and overwrite only the variable bytes
+    size_t fields_start = beginSentence(out, kGPGLLTag);
+    out += kGPGLLTemplate;
+
+    char* fields = &out[fields_start];
+    loc.latitude.copy(fields + kGPGLLLatitudeOffset, kGPGLLLatitudeWidth);
+    fields[kGPGLLNsOffset] = loc.ns;
+    loc.longitude.copy(fields + kGPGLLLongitudeOffset, kGPGLLLongitudeWidth);
+    fields[kGPGLLEwOffset] = loc.ew;
+    std::memcpy(fields + kGPGLLTimeOffset, utc.time, kGPGLLTimeWidth);
+
+    endSentence(out, fields_start, kGPGLLTag);
 }
 
 // Generate GPGSA sentence
-std::string NmeaGenerator::generateGPGSA(const std::vector<SatelliteInfo>& satellites)
+void NmeaGenerator::generateGPGSA(std::string& out, const std::vector<SatelliteInfo>& satellites)
 {
-    char mode            = 'A';
-    std::string fix_type = std::to_string(randomInt(1, 3));
+    int fix_type = randomInt(1, 3);
 
     std::vector<int> prn_list;
     // Select satellites that are used for the fix
@@ -190,7 +306,7 @@ std::string NmeaGenerator::generateGPGSA(const std::vector<SatelliteInfo>& satel
     double vdop = randomUniform(1.0, 5.0);
 
     std::ostringstream gpgsa_body;
-    gpgsa_body << "GPGSA," << mode << "," << fix_type;
+    gpgsa_body << "A," << fix_type; // Mode is always A (automatic)
     for (int prn : prn_list) {
         if (prn != 0) {
             gpgsa_body << "," << prn;
@@ -199,32 +315,34 @@ std::string NmeaGenerator::generateGPGSA(const std::vector<SatelliteInfo>& satel
         }
     }
     gpgsa_body << "," << std::fixed << std::setprecision(1) << pdop << "," << hdop << "," << vdop;
-    std::string checksum = calculateChecksum(gpgsa_body.str());
-    return "$" + gpgsa_body.str() + "*" + checksum + "\r\n";
+
+    size_t fields_start = beginSentence(out, kGPGSATag);
+    out += gpgsa_body.str();
+    endSentence(out, fields_start, kGPGSATag);
 }
 
 // Generate GxGSV sentences based on constellation
-std::string NmeaGenerator::generateGxGSV(const std::vector<SatelliteInfo>& satellites, Constellation constellation)
+void NmeaGenerator::generateGxGSV(std::string& out, const std::vector<SatelliteInfo>& satellites, Constellation constellation)
 {
-    std::string message_id;
+    SentenceTag tag;
     switch (constellation) {
     case Constellation::GPS:
-        message_id = "GPGSV";
+        tag = kGPGSVTag;
         break;
     case Constellation::GLONASS:
-        message_id = "GLGSV";
+        tag = kGLGSVTag;
         break;
     case Constellation::Galileo:
-        message_id = "GAGSV";
+        tag = kGAGSVTag;
         break;
     case Constellation::Beidou:
-        message_id = "GBGSV";
+        tag = kGBGSVTag;
         break;
     case Constellation::QZSS:
-        message_id = "GQZSV";
+        tag = kGQZSVTag;
         break;
     default:
-        message_id = "GPGSV";
+        tag = kGPGSVTag;
         break;
     }
 
@@ -238,18 +356,19 @@ std::string NmeaGenerator::generateGxGSV(const std::vector<SatelliteInfo>& satel
 
     int total_sats = constell_satellites.size();
     if (total_sats == 0) {
-        // If no satellites for this constellation, return empty string
-        return "";
+        // If no satellites for this constellation, append nothing
+        return;
     }
 
     int sats_per_message = 4;
     int total_messages   = (total_sats + sats_per_message - 1) / sats_per_message;
 
-    std::ostringstream gsv_sentences;
-
     for (int msg_num = 1; msg_num <= total_messages; ++msg_num) {
-        std::ostringstream gsv_body;
-        gsv_body << message_id << "," << total_messages << "," << msg_num << "," << total_sats;
+        size_t fields_start = beginSentence(out, tag);
+
+        char fields[64];
+        std::snprintf(fields, sizeof(fields), "%d,%d,%d", total_messages, msg_num, total_sats);
+        out += fields;
 
         int start_idx = (msg_num - 1) * sats_per_message;
         int end_idx   = std::min(start_idx + sats_per_message, total_sats);
@@ -259,97 +378,95 @@ std::string NmeaGenerator::generateGxGSV(const std::vector<SatelliteInfo>& satel
             int elevation = randomInt(0, 90);
             int azimuth   = randomInt(0, 359);
             int snr       = randomInt(0, 50);
-            gsv_body << "," << prn << "," << elevation << "," << azimuth << "," << snr;
+
+            // One format call per satellite block instead of eight stream insertions
+            std::snprintf(fields, sizeof(fields), ",%d,%d,%d,%d", prn, elevation, azimuth, snr);
+            out += fields;
         }
 
         // If less than 4 satellites in this message, fill with empty fields
         int sats_in_this_msg = end_idx - start_idx;
         for (int i = sats_in_this_msg; i < sats_per_message; ++i) {
-            gsv_body << ",,,";
+            out += ",,,";
         }
 
-        // Calculate checksum
-        std::string checksum = calculateChecksum(gsv_body.str());
-
         // Complete sentence
-        std::string sentence = "$" + gsv_body.str() + "*" + checksum + "\r\n";
-        gsv_sentences << sentence;
+        endSentence(out, fields_start, tag);
     }
-
-    return gsv_sentences.str();
 }
 
 // Generate NFIMU sentence
-std::string NmeaGenerator::generateNFIMU()
+void NmeaGenerator::generateNFIMU(std::string& out)
 {
     int calibration_status = randomInt(0, 1);
-    double temperature     = randomUniform(10, 80);
-    double acc_x           = randomUniform(-100, 100);
-    double acc_y           = randomUniform(-100, 100);
-    double acc_z           = randomUniform(-100, 100);
-    double gyro_x          = randomUniform(-2 * 3.14, 2 * 3.14);
-    double gyro_y          = randomUniform(-2 * 3.14, 2 * 3.14);
-    double gyro_z          = randomUniform(-2 * 3.14, 2 * 3.14);
 
-    std::string veh_acc_x, veh_acc_y, veh_acc_z;
-    std::string veh_gyro_x, veh_gyro_y, veh_gyro_z;
+    // Draw every reading in one batch, then scale each into its range
+    std::array<double, 13> unit;
+    std::generate(unit.begin(), unit.end(), [this] { return nextUnit(); });
+    auto scaled = [&unit](size_t i, double min, double max) { return min + (max - min) * unit[i]; };
 
-    if (calibration_status == 1) {
-        veh_acc_x  = std::to_string(acc_x + randomUniform(-10, 10));
-        veh_acc_y  = std::to_string(acc_y + randomUniform(-10, 10));
-        veh_acc_z  = std::to_string(acc_z + randomUniform(-10, 10));
-        veh_gyro_x = std::to_string(gyro_x + randomUniform(-2 * 3.14 * 0.1, 2 * 3.14 * 0.1));
-        veh_gyro_y = std::to_string(gyro_y + randomUniform(-2 * 3.14 * 0.1, 2 * 3.14 * 0.1));
-        veh_gyro_z = std::to_string(gyro_z + randomUniform(-2 * 3.14 * 0.1, 2 * 3.14 * 0.1));
-    } else {
-        veh_acc_x = veh_acc_y = veh_acc_z = veh_gyro_x = veh_gyro_y = veh_gyro_z = "";
-    }
+    double temperature = scaled(0, 10, 80);
+    double acc_x       = scaled(1, -100, 100);
+    double acc_y       = scaled(2, -100, 100);
+    double acc_z       = scaled(3, -100, 100);
+    double gyro_x      = scaled(4, -2 * 3.14, 2 * 3.14);
+    double gyro_y      = scaled(5, -2 * 3.14, 2 * 3.14);
+    double gyro_z      = scaled(6, -2 * 3.14, 2 * 3.14);
+
+    // Format all readings with one snprintf call instead of a stream insertion per field
+    char fields[128];
+    std::snprintf(fields, sizeof(fields), "%d,%.4f,%.4f,%.4f,%.4f,%.4f,%.4f,%.4f",
+                  calibration_status, temperature, acc_x, acc_y, acc_z, gyro_x, gyro_y, gyro_z);
 
-    std::ostringstream nfimu_body;
-    nfimu_body << "NFIMU," << calibration_status << "," << std::fixed << std::setprecision(4)
-               << temperature << "," << acc_x << "," << acc_y << "," << acc_z << "," << gyro_x
-               << "," << gyro_y << "," << gyro_z;
+    size_t fields_start = beginSentence(out, kNFIMUTag);
+    out += fields;
 
     // Only append veh_acc and veh_gyro if calibration_status == 1
     if (calibration_status == 1) {
-        nfimu_body << "," << veh_acc_x << "," << veh_acc_y << "," << veh_acc_z << "," << veh_gyro_x
-                   << "," << veh_gyro_y << "," << veh_gyro_z;
+        double veh_acc_x  = acc_x + scaled(7, -10, 10);
+        double veh_acc_y  = acc_y + scaled(8, -10, 10);
+        double veh_acc_z  = acc_z + scaled(9, -10, 10);
+        double veh_gyro_x = gyro_x + scaled(10, -2 * 3.14 * 0.1, 2 * 3.14 * 0.1);
+        double veh_gyro_y = gyro_y + scaled(11, -2 * 3.14 * 0.1, 2 * 3.14 * 0.1);
+        double veh_gyro_z = gyro_z + scaled(12, -2 * 3.14 * 0.1, 2 * 3.14 * 0.1);
+
+        // "%f" matches the std::to_string formatting used for these fields
+        std::snprintf(fields, sizeof(fields), ",%f,%f,%f,%f,%f,%f", veh_acc_x, veh_acc_y,
+                      veh_acc_z, veh_gyro_x, veh_gyro_y, veh_gyro_z);
+        out += fields;
     } else {
-        nfimu_body << ",,,,,"; // Placeholder commas for missing data
+        out += ",,,,,"; // Placeholder commas for missing data
     }
 
-    std::string checksum = calculateChecksum(nfimu_body.str());
-    return "$" + nfimu_body.str() + "*" + checksum + "\r\n";
+    endSentence(out, fields_start, kNFIMUTag);
 }
 
 // Generate all NMEA sentences
 std::string NmeaGenerator::generateAllSentences()
 {
+    // Every sentence is appended to one preallocated buffer
+    std::string all_sentences;
+    all_sentences.reserve(kBatchCapacity);
+    appendAllSentences(all_sentences);
+    return all_sentences;
+}
+
+// Append one cycle of NMEA sentences to an existing buffer
+void NmeaGenerator::appendAllSentences(std::string& all_sentences)
+{
+    UtcTimestamp utc                      = getUTCTimestamp();
     LocationData loc                      = generateLocation();
     std::vector<SatelliteInfo> satellites = generateSatellites();
 
-    std::ostringstream all_sentences;
-    all_sentences << generateGPRMC(loc);
-    all_sentences << generateGPGGA(loc, randomInt(4, 12));
-    all_sentences << generateGPGSA(satellites);
+    generateGPRMC(all_sentences, utc, loc);
+    generateGPGGA(all_sentences, utc, loc, randomInt(4, 12));
+    generateGPGSA(all_sentences, satellites);
 
     // Generate GSV sentences for each constellation
-    std::vector<Constellation> constellations = {
-        Constellation::GPS,
-        Constellation::GLONASS,
-        Constellation::Galileo,
-        Constellation::Beidou,
-        Constellation::QZSS
-    };
-
-    for (const auto& constell : constellations) {
-        std::string gsv = generateGxGSV(satellites, constell);
-        if (!gsv.empty()) {
-            all_sentences << gsv;
-        }
+    for (Constellation constell : kGSVConstellations) {
+        generateGxGSV(all_sentences, satellites, constell);
     }
 
-    all_sentences << generateGPGLL(loc);
-    all_sentences << generateNFIMU();
-    return all_sentences.str();
+    generateGPGLL(all_sentences, utc, loc);
+    generateNFIMU(all_sentences);
 }
@@ -2,12 +2,15 @@
 #ifndef NMEA_GENERATOR_HPP
 #define NMEA_GENERATOR_HPP
 
+#include <array>
 #include <chrono>
+#include <cstdint>
 #include <ctime>
 #include <iomanip>
 #include <random>
 #include <sstream>
 #include <string>
+#include <string_view>
 #include <vector>
 
 // Enum for satellite constellations
@@ -33,6 +36,18 @@ struct LocationData {
     char ew;
 };
 
+// Structure to hold a sentence tag (address field and trailing comma) and its XOR
+struct SentenceTag {
+    std::string_view text;
+    uint8_t checksum;
+};
+
+// Structure to hold the UTC time and date shared by one batch of sentences
+struct UtcTimestamp {
+    char time[16]; // HHMMSS
+    char date[16]; // DDMMYY
+};
+
 class NmeaGenerator {
 public:
     NmeaGenerator();
@@ -41,37 +56,53 @@ public:
     // Generate all NMEA sentences
     std::string generateAllSentences();
 
+    // Append one cycle of NMEA sentences to an existing buffer
+    void appendAllSentences(std::string& out);
+
 private:
     // Random number generation
+    double nextUnit();
     double randomUniform(double min, double max);
     int randomInt(int min, int max);
 
-    // Checksum calculation
-    std::string calculateChecksum(const std::string& nmea_sentence) const;
+    // Sentence framing written straight into the batch buffer
+    size_t beginSentence(std::string& out, const SentenceTag& tag) const;
+    void endSentence(std::string& out, size_t fields_start, const SentenceTag& tag) const;
 
     // Time and date retrieval
-    std::string getUTCTime() const;
-    std::string getUTCDate() const;
+    UtcTimestamp getUTCTimestamp();
 
     // Location generation
     LocationData generateLocation();
 
     // Satellite generation
     std::vector<SatelliteInfo> generateSatellites();
+    void sampleSatellites(std::vector<SatelliteInfo>& satellites, Constellation constellation,
+                          int first_prn, int last_prn, int count);
 
-    // NMEA sentence generation
-    std::string generateGPGGA(const LocationData& loc, int numSatellites);
-    std::string generateGPRMC(const LocationData& loc);
-    std::string generateGPGLL(const LocationData& loc);
-    std::string generateGPGSA(const std::vector<SatelliteInfo>& satellites);
-    std::string generateGxGSV(const std::vector<SatelliteInfo>& satellites, Constellation constellation);
-    std::string generateNFIMU();
+    // NMEA sentence generation, each appending to the batch buffer
+    void generateGPGGA(std::string& out, const UtcTimestamp& utc, const LocationData& loc, int numSatellites);
+    void generateGPRMC(std::string& out, const UtcTimestamp& utc, const LocationData& loc);
+    void generateGPGLL(std::string& out, const UtcTimestamp& utc, const LocationData& loc);
+    void generateGPGSA(std::string& out, const std::vector<SatelliteInfo>& satellites);
+    void generateGxGSV(std::string& out, const std::vector<SatelliteInfo>& satellites, Constellation constellation);
+    void generateNFIMU(std::string& out);
 
     // Generate multiple GSV sentences for all constellations
     std::string generateGPGSV(const std::vector<SatelliteInfo>& satellites);
 
     // Random device and generator
     std::mt19937 rng_;
+    std::uniform_real_distribution<double> unit_dist_ { 0.0, 1.0 };
+
+    // Pool of [0, 1) draws refilled in bulk, so each random value is an indexed read
+    static constexpr size_t kUnitPoolSize = 1024;
+    std::array<double, kUnitPoolSize> unit_pool_;
+    size_t unit_pool_pos_ = kUnitPoolSize;
+
+    // DDMMYY for the current UTC day, reformatted only when the day changes
+    int64_t cached_day_ = -1;
+    char cached_date_[16] {};
 };
 
 #endif // NMEA_GENERATOR_HPP
@@ -5,14 +5,20 @@ NmeaSimulator::NmeaSimulator(const std::string& pipe_path,
                              const std::string& serial_port,
                              const std::string& file_path, // Updated constructor
                              double interval,
-                             const std::string& symlink_path)
+                             const std::string& symlink_path,
+                             int batch_size,
+                             bool quiet,
+                             bool realtime)
     : pipe_path_(pipe_path)
     , serial_port_(serial_port)
     , file_path_(file_path) // Initialize new member
     , interval_(interval)
     , symlink_path_(symlink_path)
+    , batch_size_(batch_size)
+    , quiet_(quiet)
+    , realtime_(realtime)
     , generator_()
-    , pty_handler_(pipe_path_, serial_port_, symlink_path_, interval_, &generator_, file_path_) // Pass file_path_
+    , pty_handler_(pipe_path_, serial_port_, symlink_path_, interval_, &generator_, file_path_, batch_size_, quiet_, realtime_)
 {
 }
 
@@ -12,7 +12,10 @@ public:
                   const std::string& serial_port,
                   const std::string& file_path, // New parameter
                   double interval,
-                  const std::string& symlink_path);
+                  const std::string& symlink_path,
+                  int batch_size = 1,
+                  bool quiet     = false,
+                  bool realtime  = false);
     ~NmeaSimulator();
 
     // Start the simulator
@@ -24,6 +27,9 @@ private:
     std::string file_path_; // New member variable
     double interval_;
     std::string symlink_path_;
+    int batch_size_;
+    bool quiet_;
+    bool realtime_;
 
     NmeaGenerator generator_;
     PtyHandler pty_handler_;
@@ -2,14 +2,20 @@
 #include "PtyHandler.hpp"
 #include "NmeaGenerator.hpp"
 
+#include <chrono>
+#include <climits>
 #include <cstring>
 #include <fcntl.h>
 #include <fstream>
 #include <iostream>
+#include <poll.h>
 #include <pty.h>
+#include <sched.h>
 #include <signal.h>
 #include <sys/stat.h>
+#include <sys/uio.h>
 #include <termios.h>
+#include <thread>
 #include <unistd.h>
 #include <vector>
 
@@ -22,7 +28,10 @@ PtyHandler::PtyHandler(const std::string& pipe_path,
                        const std::string& symlink_path,
                        double interval,
                        NmeaGenerator* generator,
-                       const std::string& file_path) // Updated constructor
+                       const std::string& file_path, // Updated constructor
+                       int batch_size,
+                       bool quiet,
+                       bool realtime)
     : pipe_path_(pipe_path)
     , serial_port_(serial_port)
     , symlink_path_(symlink_path)
@@ -31,6 +40,10 @@ PtyHandler::PtyHandler(const std::string& pipe_path,
     , master_fd_(-1)
     , generator_(generator)
     , file_path_(file_path) // Initialize new member
+    , batch_size_(batch_size)
+    , quiet_(quiet)
+    , realtime_(realtime)
+    , wake_pipe_ { -1, -1 }
 {
 }
 
@@ -44,8 +57,22 @@ PtyHandler::~PtyHandler()
 void PtyHandler::signalHandler(int signal)
 {
     if (signal == SIGINT && instance_) {
-        std::cout << "\nKeyboardInterrupt received. Shutting down..." << std::endl;
+        // The writer may be mid-insertion into std::cout, so report with a raw write() instead
+        static const char message[] = "\nKeyboardInterrupt received. Shutting down...\n";
+        ssize_t ignored = write(STDERR_FILENO, message, sizeof(message) - 1);
+        (void)ignored;
         instance_->shutdown_event_.store(true);
+        instance_->wakeWriter();
+    }
+}
+
+// Wake a writer blocked in sleepUntilNextTick; write() is async-signal-safe
+void PtyHandler::wakeWriter()
+{
+    if (wake_pipe_[1] != -1) {
+        char byte = 1;
+        ssize_t ignored = write(wake_pipe_[1], &byte, 1);
+        (void)ignored;
     }
 }
 
@@ -53,38 +80,66 @@ void PtyHandler::signalHandler(int signal)
 void PtyHandler::setupSignalHandler()
 {
     instance_ = this;
+
+    // Self-pipe that turns a shutdown request into a readable descriptor for the tick wait
+    if (pipe2(wake_pipe_, O_CLOEXEC | O_NONBLOCK) != 0) {
+        std::cerr << "Error creating wake pipe: " << strerror(errno) << std::endl;
+        wake_pipe_[0] = wake_pipe_[1] = -1;
+    }
+
     struct sigaction sa;
     sa.sa_handler = PtyHandler::signalHandler;
     sigemptyset(&sa.sa_mask);
     sa.sa_flags = 0;
     sigaction(SIGINT, &sa, nullptr);
+
+    // Report a vanished pipe reader as EPIPE from write() instead of terminating
+    signal(SIGPIPE, SIG_IGN);
+}
+
+// Pin the writer (the calling thread) to its current CPU and raise it to SCHED_FIFO to cut tick jitter
+void PtyHandler::setupRealtime()
+{
+    cpu_set_t cpus;
+    CPU_ZERO(&cpus);
+    int cpu = sched_getcpu();
+    CPU_SET(cpu < 0 ? 0 : cpu, &cpus);
+    if (sched_setaffinity(0, sizeof(cpus), &cpus) != 0) {
+        std::cerr << "Warning: could not set CPU affinity: " << strerror(errno) << std::endl;
+    }
+
+    struct sched_param param = {};
+    param.sched_priority     = 10;
+    if (sched_setscheduler(0, SCHED_FIFO, &param) != 0) {
+        std::cerr << "Warning: could not enable SCHED_FIFO (needs CAP_SYS_NICE): " << strerror(errno)
+                  << std::endl;
+    }
 }
 
 // Start the handler
 void PtyHandler::start()
 {
     setupSignalHandler();
+    if (realtime_) {
+        setupRealtime();
+    }
 
     if (!serial_port_.empty()) {
         std::cout << "Using serial port: " << serial_port_ << std::endl;
-        writer_thread_ = std::thread(&PtyHandler::writerSerial, this);
+        writerSerial();
     } else if (!pipe_path_.empty()) {
         setupNamedPipe();
         if (shutdown_event_.load())
             return; // Exit if setup failed
         std::cout << "Connect your GNSS-consuming application to the named pipe: " << pipe_path_
                   << std::endl;
-        writer_thread_ = std::thread(&PtyHandler::writerPipe, this);
+        writerPipe();
     } else {
         setupPTY();
         if (shutdown_event_.load())
             return; // Exit if setup failed
         // The setupPTY now already prints the symlink path
-        writer_thread_ = std::thread(&PtyHandler::writerPTY, this);
-    }
-
-    if (writer_thread_.joinable()) {
-        writer_thread_.join();
+        writerPTY();
     }
 
     cleanup();
@@ -206,118 +261,77 @@ bool isRmcSentence(const std::string& line)
     return (line.compare(start, 6, "$GPRMC") == 0 || line.compare(start, 6, "$GNRMC") == 0 || line.compare(start, 6, "$GLRMC") == 0 || line.compare(start, 6, "$GRRMC") == 0 || line.compare(start, 6, "$GGRMC") == 0);
 }
 
-// Writer to named pipe
-void PtyHandler::writerPipe()
+// Helper function to write a cycle of sentences, each followed by CRLF, without joining them
+ssize_t writeCycle(int fd, const std::vector<std::string>& cycle_buffer)
 {
-    if (!file_path_.empty()) {
-        // Mode: Read from file with cycle consideration
-        std::ifstream infile(file_path_);
-        if (!infile.is_open()) {
-            std::cerr << "Error opening NMEA log file: " << file_path_ << std::endl;
-            shutdown_event_.store(true);
-            return;
-        }
-        std::string line;
-        std::vector<std::string> cycle_buffer;
-
-        while (!shutdown_event_.load()) {
-            while (std::getline(infile, line)) {
-                if (shutdown_event_.load())
-                    break;
-                if (line.empty())
-                    continue;
-
-                // Check if the line is an RMC sentence
-                if (isRmcSentence(line)) {
-                    // If buffer has data, send it as one cycle
-                    if (!cycle_buffer.empty()) {
-                        // Open the pipe in append mode
-                        std::ofstream pipe(pipe_path_, std::ios::app);
-                        if (!pipe.is_open()) {
-                            std::cerr << "Error opening pipe: " << pipe_path_ << std::endl;
-                            shutdown_event_.store(true);
-                            break;
-                        }
-
-                        // Send all sentences in the buffer
-                        for (const auto& sentence : cycle_buffer) {
-                            pipe << sentence << "\r\n";
-                        }
-                        pipe.flush();
-                        std::cout << "Sent to pipe (Cycle):\n";
-                        for (const auto& sentence : cycle_buffer) {
-                            std::cout << sentence << "\n";
-                        }
+    static const char crlf[] = "\r\n";
 
-                        // Clear the buffer for the next cycle
-                        cycle_buffer.clear();
-
-                        // Sleep for the specified interval
-                        std::this_thread::sleep_for(std::chrono::duration<double>(interval_));
-                    }
-
-                    // Start a new cycle buffer with the current RMC sentence
-                    cycle_buffer.push_back(line);
-                } else {
-                    // Add non-RMC sentences to the current cycle buffer
-                    cycle_buffer.push_back(line);
-                }
-            }
+    std::vector<struct iovec> iov;
+    iov.reserve(cycle_buffer.size() * 2);
+    for (const auto& sentence : cycle_buffer) {
+        iov.push_back({ const_cast<char*>(sentence.data()), sentence.size() });
+        iov.push_back({ const_cast<char*>(crlf), sizeof(crlf) - 1 });
+    }
 
-            // After reaching EOF, reset to the beginning for continuous simulation
-            infile.clear(); // Clear EOF flag
-            infile.seekg(0, std::ios::beg);
+    // One writev call per IOV_MAX entries, which is a single call for any realistic cycle
+    ssize_t total_written = 0;
+    for (size_t offset = 0; offset < iov.size(); offset += IOV_MAX) {
+        int count             = static_cast<int>(std::min<size_t>(iov.size() - offset, IOV_MAX));
+        ssize_t bytes_written = writev(fd, iov.data() + offset, count);
+        if (bytes_written == -1) {
+            return -1;
         }
-        infile.close();
+        total_written += bytes_written;
+    }
+    return total_written;
+}
 
-        // Send any remaining data in the buffer upon shutdown
-        if (!cycle_buffer.empty()) {
-            std::ofstream pipe(pipe_path_, std::ios::app);
-            if (pipe.is_open()) {
-                for (const auto& sentence : cycle_buffer) {
-                    pipe << sentence << "\r\n";
-                }
-                pipe.flush();
-                std::cout << "Sent to pipe (Final Cycle):\n";
-                for (const auto& sentence : cycle_buffer) {
-                    std::cout << sentence << "\n";
-                }
-            }
-        }
-    } else {
-        // Mode: Generate data
-        while (!shutdown_event_.load()) {
-            std::ofstream pipe(pipe_path_);
-            if (!pipe.is_open()) {
-                std::cerr << "Error opening pipe: " << pipe_path_ << std::endl;
-                break;
-            }
-            while (!shutdown_event_.load()) {
-                std::string sentences = generator_->generateAllSentences();
-                pipe << sentences;
-                pipe.flush();
-                std::cout << "Sent to pipe:\n"
-                          << sentences;
-                std::this_thread::sleep_for(std::chrono::duration<double>(interval_));
-            }
+// Helper function to sleep until the next tick of a fixed-rate schedule, so time spent generating and writing does not add drift.
+// The wait ends early once wake_fd becomes readable, so shutdown does not have to wait out the interval
+void sleepUntilNextTick(std::chrono::steady_clock::time_point& deadline, double period, int wake_fd)
+{
+    deadline += std::chrono::duration_cast<std::chrono::steady_clock::duration>(std::chrono::duration<double>(period));
+    auto now = std::chrono::steady_clock::now();
+    if (deadline < now) {
+        // Fell behind (e.g. blocked opening the device); resynchronise instead of bursting to catch up
+        deadline = now;
+        return;
+    }
+
+    struct pollfd wake = { wake_fd, POLLIN, 0 };
+    while (now < deadline) {
+        auto remaining = std::chrono::duration_cast<std::chrono::nanoseconds>(deadline - now).count();
+        struct timespec timeout = { static_cast<time_t>(remaining / 1000000000), static_cast<long>(remaining % 1000000000) };
+        if (ppoll(&wake, 1, &timeout, nullptr) > 0) {
+            return;
         }
+        now = std::chrono::steady_clock::now();
     }
-    std::cout << "Pipe writer thread exiting." << std::endl;
 }
 
-// Writer to serial port
-void PtyHandler::writerSerial()
+// Shared writer loop: replays the log file or generates sentences into an open descriptor.
+// Returns false if a write failed, true once shutdown was requested
+bool PtyHandler::writerLoop(int fd, const std::string& target, const std::string& target_path)
 {
+    auto reportWriteError = [&]() {
+        std::cerr << "Error writing to " << target;
+        if (!target_path.empty()) {
+            std::cerr << ": " << target_path;
+        }
+        std::cerr << std::endl;
+    };
+
     if (!file_path_.empty()) {
         // Mode: Read from file with cycle consideration
         std::ifstream infile(file_path_);
         if (!infile.is_open()) {
             std::cerr << "Error opening NMEA log file: " << file_path_ << std::endl;
             shutdown_event_.store(true);
-            return;
+            return true;
         }
         std::string line;
         std::vector<std::string> cycle_buffer;
+        auto deadline = std::chrono::steady_clock::now();
 
         while (!shutdown_event_.load()) {
             while (std::getline(infile, line)) {
@@ -330,37 +344,23 @@ void PtyHandler::writerSerial()
                 if (isRmcSentence(line)) {
                     // If buffer has data, send it as one cycle
                     if (!cycle_buffer.empty()) {
-                        int fd = open(serial_port_.c_str(), O_WRONLY | O_NOCTTY);
-                        if (fd == -1) {
-                            std::cerr << "Error opening serial port: " << serial_port_ << std::endl;
-                            shutdown_event_.store(true);
-                            break;
-                        }
-
                         // Send all sentences in the buffer
-                        for (const auto& sentence : cycle_buffer) {
-                            std::string full_sentence = sentence + "\r\n";
-                            ssize_t bytes_written     = write(fd, full_sentence.c_str(), full_sentence.size());
-                            if (bytes_written == -1) {
-                                std::cerr << "Error writing to serial port: " << serial_port_ << std::endl;
-                                close(fd);
-                                shutdown_event_.store(true);
-                                break;
-                            }
+                        if (writeCycle(fd, cycle_buffer) == -1) {
+                            reportWriteError();
+                            return false;
                         }
-                        fsync(fd);
-                        std::cout << "Sent to serial port (Cycle):\n";
-                        for (const auto& sentence : cycle_buffer) {
-                            std::cout << sentence << "\n";
+                        if (!quiet_) {
+                            std::cout << "Sent to " << target << " (Cycle):\n";
+                            for (const auto& sentence : cycle_buffer) {
+                                std::cout << sentence << "\n";
+                            }
                         }
 
-                        close(fd);
-
                         // Clear the buffer for the next cycle
                         cycle_buffer.clear();
 
-                        // Sleep for the specified interval
-                        std::this_thread::sleep_for(std::chrono::duration<double>(interval_));
+                        // Sleep until the next interval tick
+                        sleepUntilNextTick(deadline, interval_, wake_pipe_[0]);
                     }
 
                     // Start a new cycle buffer with the current RMC sentence
@@ -379,142 +379,79 @@ void PtyHandler::writerSerial()
 
         // Send any remaining data in the buffer upon shutdown
         if (!cycle_buffer.empty()) {
-            int fd = open(serial_port_.c_str(), O_WRONLY | O_NOCTTY);
-            if (fd != -1) {
-                for (const auto& sentence : cycle_buffer) {
-                    std::string full_sentence = sentence + "\r\n";
-                    ssize_t bytes_written     = write(fd, full_sentence.c_str(), full_sentence.size());
-                    if (bytes_written == -1) {
-                        std::cerr << "Error writing to serial port: " << serial_port_ << std::endl;
-                        break;
-                    }
-                }
-                fsync(fd);
-                std::cout << "Sent to serial port (Final Cycle):\n";
+            if (writeCycle(fd, cycle_buffer) == -1) {
+                reportWriteError();
+            } else if (!quiet_) {
+                std::cout << "Sent to " << target << " (Final Cycle):\n";
                 for (const auto& sentence : cycle_buffer) {
                     std::cout << sentence << "\n";
                 }
-                close(fd);
             }
         }
     } else {
         // Mode: Generate data
-        int fd = open(serial_port_.c_str(), O_WRONLY | O_NOCTTY);
-        if (fd == -1) {
-            std::cerr << "Error opening serial port: " << serial_port_ << std::endl;
-            return;
-        }
-
+        auto deadline = std::chrono::steady_clock::now();
         while (!shutdown_event_.load()) {
-            std::string sentences = generator_->generateAllSentences();
-            ssize_t bytes_written = write(fd, sentences.c_str(), sentences.size());
+            send_buffer_.clear();
+            for (int i = 0; i < batch_size_; ++i) {
+                generator_->appendAllSentences(send_buffer_);
+            }
+            ssize_t bytes_written = write(fd, send_buffer_.data(), send_buffer_.size());
             if (bytes_written == -1) {
-                std::cerr << "Error writing to serial port: " << serial_port_ << std::endl;
-                break;
+                reportWriteError();
+                return false;
+            }
+            if (!quiet_) {
+                std::cout << "Sent to " << target << ":\n"
+                          << send_buffer_;
             }
-            fsync(fd);
-            std::cout << "Sent to serial port:\n"
-                      << sentences;
-            std::this_thread::sleep_for(std::chrono::duration<double>(interval_));
+            sleepUntilNextTick(deadline, interval_ * batch_size_, wake_pipe_[0]);
         }
-        close(fd);
-        std::cout << "Serial port writer thread exiting." << std::endl;
     }
+    return true;
 }
 
-// Writer to PTY
-void PtyHandler::writerPTY()
+// Writer to named pipe
+void PtyHandler::writerPipe()
 {
-    if (!file_path_.empty()) {
-        // Mode: Read from file with cycle consideration
-        std::ifstream infile(file_path_);
-        if (!infile.is_open()) {
-            std::cerr << "Error opening NMEA log file: " << file_path_ << std::endl;
-            shutdown_event_.store(true);
-            return;
+    while (!shutdown_event_.load()) {
+        // Write straight to the descriptor; there is no stream buffer to flush
+        int fd = open(pipe_path_.c_str(), O_WRONLY | O_CLOEXEC);
+        if (fd == -1) {
+            std::cerr << "Error opening pipe: " << pipe_path_ << std::endl;
+            break;
         }
-        std::string line;
-        std::vector<std::string> cycle_buffer;
-
-        while (!shutdown_event_.load()) {
-            while (std::getline(infile, line)) {
-                if (shutdown_event_.load())
-                    break;
-                if (line.empty())
-                    continue;
-
-                // Check if the line is an RMC sentence
-                if (isRmcSentence(line)) {
-                    // If buffer has data, send it as one cycle
-                    if (!cycle_buffer.empty()) {
-                        // Send all sentences in the buffer
-                        for (const auto& sentence : cycle_buffer) {
-                            std::string full_sentence = sentence + "\r\n";
-                            ssize_t bytes_written     = write(master_fd_, full_sentence.c_str(), full_sentence.size());
-                            if (bytes_written == -1) {
-                                std::cerr << "Error writing to PTY" << std::endl;
-                                shutdown_event_.store(true);
-                                break;
-                            }
-                        }
-                        std::cout << "Sent to PTY (Cycle):\n";
-                        for (const auto& sentence : cycle_buffer) {
-                            std::cout << sentence << "\n";
-                        }
-
-                        // Clear the buffer for the next cycle
-                        cycle_buffer.clear();
-
-                        // Sleep for the specified interval
-                        std::this_thread::sleep_for(std::chrono::duration<double>(interval_));
-                    }
-
-                    // Start a new cycle buffer with the current RMC sentence
-                    cycle_buffer.push_back(line);
-                } else {
-                    // Add non-RMC sentences to the current cycle buffer
-                    cycle_buffer.push_back(line);
-                }
-            }
+        // A failed write means the reader went away; reopen and wait for the next one
+        writerLoop(fd, "pipe", pipe_path_);
+        close(fd);
+    }
+    std::cout << "Pipe writer exiting." << std::endl;
+}
 
-            // After reaching EOF, reset to the beginning for continuous simulation
-            infile.clear(); // Clear EOF flag
-            infile.seekg(0, std::ios::beg);
-        }
-        infile.close();
+// Writer to serial port
+void PtyHandler::writerSerial()
+{
+    int fd = open(serial_port_.c_str(), O_WRONLY | O_NOCTTY | O_CLOEXEC);
+    if (fd == -1) {
+        std::cerr << "Error opening serial port: " << serial_port_ << std::endl;
+        shutdown_event_.store(true);
+        return;
+    }
+    if (!writerLoop(fd, "serial port", serial_port_)) {
+        shutdown_event_.store(true);
+    }
+    close(fd);
+    std::cout << "Serial port writer exiting." << std::endl;
+}
 
-        // Send any remaining data in the buffer upon shutdown
-        if (!cycle_buffer.empty()) {
-            for (const auto& sentence : cycle_buffer) {
-                std::string full_sentence = sentence + "\r\n";
-                ssize_t bytes_written     = write(master_fd_, full_sentence.c_str(), full_sentence.size());
-                if (bytes_written == -1) {
-                    std::cerr << "Error writing to PTY" << std::endl;
-                    break;
-                }
-            }
-            std::cout << "Sent to PTY (Final Cycle):\n";
-            for (const auto& sentence : cycle_buffer) {
-                std::cout << sentence << "\n";
-            }
-        }
-    } else {
-        // Mode: Generate data
-        while (!shutdown_event_.load()) {
-            std::string sentences = generator_->generateAllSentences();
-            ssize_t bytes_written = write(master_fd_, sentences.c_str(), sentences.size());
-            if (bytes_written == -1) {
-                std::cerr << "Error writing to PTY" << std::endl;
-                shutdown_event_.store(true);
-                break;
-            }
-            std::cout << "Sent to PTY:\n"
-                      << sentences;
-            std::this_thread::sleep_for(std::chrono::duration<double>(interval_));
-        }
+// Writer to PTY
+void PtyHandler::writerPTY()
+{
+    if (!writerLoop(master_fd_, "PTY", "")) {
+        shutdown_event_.store(true);
     }
     close(master_fd_);
-    std::cout << "PTY writer thread exiting." << std::endl;
+    std::cout << "PTY writer exiting." << std::endl;
 }
 
 // Cleanup resources
@@ -539,7 +476,15 @@ void PtyHandler::cleanup()
 
     if (master_fd_ != -1) {
         close(master_fd_);
-        std::cout << "PTY writer thread exiting." << std::endl;
+        std::cout << "PTY writer exiting." << std::endl;
+    }
+
+    // Close the shutdown wake pipe
+    for (int& fd : wake_pipe_) {
+        if (fd != -1) {
+            close(fd);
+            fd = -1;
+        }
     }
 
     std::cout << "PtyHandler exited gracefully." << std::endl;
@@ -549,4 +494,5 @@ void PtyHandler::cleanup()
 void PtyHandler::signalShutdown()
 {
     shutdown_event_.store(true);
+    wakeWriter();
 }
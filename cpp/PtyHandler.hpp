@@ -5,7 +5,6 @@
 #include <atomic>
 #include <functional>
 #include <string>
-#include <thread>
 
 // Forward declaration of NmeaGenerator
 class NmeaGenerator;
@@ -17,7 +16,10 @@ public:
                const std::string& symlink_path,
                double interval,
                NmeaGenerator* generator,
-               const std::string& file_path = ""); // New parameter with default value
+               const std::string& file_path = "", // New parameter with default value
+               int batch_size               = 1,
+               bool quiet                   = false,
+               bool realtime                = false);
     ~PtyHandler();
 
     // Start the PTY or named pipe or serial port writer
@@ -29,6 +31,8 @@ public:
 private:
     // Setup methods
     void setupSignalHandler();
+    void wakeWriter();
+    void setupRealtime();
     void setupNamedPipe();
     void setupPTY();
 
@@ -39,6 +43,7 @@ private:
     void writerPipe();
     void writerSerial();
     void writerPTY();
+    bool writerLoop(int fd, const std::string& target, const std::string& target_path);
 
     // Member variables
     std::string pipe_path_;
@@ -46,10 +51,14 @@ private:
     std::string symlink_path_;
     double interval_;
     std::atomic<bool> shutdown_event_;
-    std::thread writer_thread_;
     int master_fd_;
     std::string slave_name_;
     std::string file_path_; // New member variable
+    int batch_size_; // Generated cycles combined into each write
+    bool quiet_; // Suppress the per-cycle echo of sent sentences
+    bool realtime_; // Pin the writer to one CPU and run it with SCHED_FIFO
+    std::string send_buffer_; // Generated batch, cleared but not freed between ticks
+    int wake_pipe_[2]; // Self-pipe written on shutdown to end the tick wait early
 
     // Pointer to NmeaGenerator
     NmeaGenerator* generator_;
@@ -1,14 +1,25 @@
 // main.cpp
 #include "NmeaSimulator.hpp"
+#include <cmath>
 #include <iostream>
 #include <string>
+#include <unistd.h>
 
 int main(int argc, char* argv[])
 {
+    // When stdout is redirected (a log file, journald), let std::cout buffer on its own
+    // instead of forwarding every insertion to stdio
+    if (!isatty(STDOUT_FILENO)) {
+        std::ios::sync_with_stdio(false);
+    }
+
     std::string pipe_path    = "";
     std::string serial_port  = "";
     std::string file_path    = ""; // New variable for the NMEA log file
     double interval          = 1.0; // Default interval in seconds
+    int batch_size           = 1; // Generated cycles per write
+    bool quiet               = false; // Suppress per-cycle output
+    bool realtime            = false; // Pin the writer and use SCHED_FIFO
     std::string symlink_path = "/tmp/ttySIMULATOR"; // Default symlink path
 
     // Simple command-line argument parsing
@@ -22,6 +33,12 @@ int main(int argc, char* argv[])
             file_path = argv[++i];
         } else if ((arg == "-i" || arg == "--interval") && i + 1 < argc) {
             interval = std::stod(argv[++i]);
+        } else if ((arg == "-b" || arg == "--batch") && i + 1 < argc) {
+            batch_size = std::stoi(argv[++i]);
+        } else if (arg == "-q" || arg == "--quiet") {
+            quiet = true;
+        } else if (arg == "-r" || arg == "--realtime") {
+            realtime = true;
         } else if ((arg == "-l" || arg == "--link") && i + 1 < argc) {
             symlink_path = argv[++i];
         } else if (arg == "-h" || arg == "--help") {
@@ -29,22 +46,35 @@ int main(int argc, char* argv[])
                       << "Options:\n"
                       << "  -p, --pipe <path>       Specify named pipe path\n"
                       << "  -s, --serial <port>     Specify serial port\n"
-                      << "  -f, --file <path>       Specify NMEA log file path\n" // Help for new option
+                      << "  -f, --file <path>       Specify NMEA log file path to replay instead of generating\n" // Help for new option
                       << "  -i, --interval <sec>    Specify interval between sentences (default: 1.0)\n"
+                      << "  -b, --batch <count>     Specify generated cycles combined into each write (default: 1)\n"
+                      << "  -q, --quiet             Do not echo sent sentences to stdout\n"
+                      << "  -r, --realtime          Pin the writer to one CPU and run it with SCHED_FIFO (needs CAP_SYS_NICE)\n"
                       << "  -l, --link <symlink>    Specify symbolic link path for PTY (default: /tmp/ttySIMULATOR)\n"
                       << "  -h, --help              Show this help message\n";
             return 0;
         }
     }
 
-    // Validate that either generator or file is specified, but not both
-    if (!file_path.empty() && (!pipe_path.empty() || !serial_port.empty())) {
-        std::cerr << "Error: When using --file, do not specify --pipe or --serial options.\n";
+    if (batch_size < 1) {
+        std::cerr << "Error: --batch must be at least 1.\n";
+        return 1;
+    }
+
+    if (std::isnan(interval) || interval < 0.0) {
+        std::cerr << "Error: --interval must be a non-negative number.\n";
+        return 1;
+    }
+
+    // Under SCHED_FIFO a zero interval never sleeps and would starve everything else on the pinned CPU
+    if (realtime && interval <= 0.0) {
+        std::cerr << "Error: --interval must be greater than 0 with --realtime.\n";
         return 1;
     }
 
     // Initialize the simulator with the provided arguments
-    NmeaSimulator simulator(pipe_path, serial_port, file_path, interval, symlink_path);
+    NmeaSimulator simulator(pipe_path, serial_port, file_path, interval, symlink_path, batch_size, quiet, realtime);
     simulator.start();
 
     return 0;
@@ -8,14 +8,14 @@ use pty_handler::PtyHandler;
 use signal_hook::consts::SIGINT;
 use signal_hook::iterator::Signals;
 use std::error::Error;
-use std::fs::OpenOptions;
-use std::io::Write;
+use std::fs::{File, OpenOptions};
+use std::io::{IoSlice, Write};
 use std::sync::{
     atomic::{AtomicBool, Ordering},
     Arc,
 };
 use std::thread;
-use std::time::Duration;
+use std::time::{Duration, Instant};
 
 fn main() -> Result<(), Box<dyn Error>> {
     let shutdown_event = Arc::new(AtomicBool::new(false));
@@ -31,15 +31,25 @@ fn main() -> Result<(), Box<dyn Error>> {
         }
     });
 
-    // Ensure correct number of arguments
+    // Ensure correct number of arguments; -q/--quiet may appear anywhere
     let args: Vec<String> = std::env::args().collect();
-    if args.len() != 3 {
-        eprintln!("Usage: {} <gps_input_path> <gps_output_path>", args[0]);
+    let is_quiet_flag = |arg: &str| arg == "-q" || arg == "--quiet";
+    let quiet = args.iter().skip(1).any(|arg| is_quiet_flag(arg));
+    let paths: Vec<&String> = args
+        .iter()
+        .skip(1)
+        .filter(|arg| !is_quiet_flag(arg))
+        .collect();
+    if paths.len() != 2 {
+        eprintln!(
+            "Usage: {} [-q|--quiet] <gps_input_path> <gps_output_path>",
+            args[0]
+        );
         std::process::exit(1);
     }
 
-    let gps_input_path = &args[1];
-    let gps_output_path = &args[2];
+    let gps_input_path = paths[0];
+    let gps_output_path = paths[1];
 
     // Initialize PTY handler
     let mut pty_handler = PtyHandler::new(shutdown_event.clone());
@@ -50,8 +60,12 @@ fn main() -> Result<(), Box<dyn Error>> {
     let mut nmea_generator = NmeaGenerator::new();
 
     // Write NMEA messages to /tmp/gps_input
-    if let Err(e) = write_nmea_messages(gps_input_path, &mut nmea_generator, shutdown_event.clone())
-    {
+    if let Err(e) = write_nmea_messages(
+        gps_input_path,
+        &mut nmea_generator,
+        shutdown_event.clone(),
+        quiet,
+    ) {
         eprintln!("Error writing NMEA messages: {}", e);
     }
 
@@ -65,10 +79,11 @@ fn write_nmea_messages(
     gps_input_path: &str,
     nmea_generator: &mut NmeaGenerator,
     shutdown_event: Arc<AtomicBool>,
+    quiet: bool,
 ) -> Result<(), Box<dyn Error>> {
     // Open the GPS input PTY for writing
     println!("Opening GPS input path: {}", gps_input_path);
-    let gps_input = OpenOptions::new()
+    let mut gps_input = OpenOptions::new()
         .write(true)
         .open(gps_input_path)
         .map_err(|e| {
@@ -76,22 +91,57 @@ fn write_nmea_messages(
             e
         })?;
 
-    let mut writer = std::io::BufWriter::new(gps_input);
-
-    // Main loop to write NMEA messages
+    // Main loop to write NMEA messages, paced by a monotonic deadline so write time does not add drift
+    let interval = Duration::from_secs(1);
+    let mut deadline = Instant::now();
     while !shutdown_event.load(Ordering::SeqCst) {
-        let sentence = nmea_generator.generate_sentences();
-        if let Err(e) = writer.write_all(sentence.as_bytes()) {
+        let sentences = nmea_generator.generate_sentences();
+        if let Err(e) = write_all_vectored(&mut gps_input, &sentences) {
             eprintln!("Error writing to {}: {}", gps_input_path, e);
             break;
         }
-        if let Err(e) = writer.flush() {
-            eprintln!("Error flushing to {}: {}", gps_input_path, e);
-            break;
+        // Echoing goes through the line-buffered stdout, flushing as lines complete, so it is optional
+        if !quiet {
+            echo_sentences(gps_input_path, &sentences);
+        }
+        deadline += interval;
+        let now = Instant::now();
+        if deadline > now {
+            thread::sleep(deadline - now);
+        } else {
+            deadline = now;
+        }
+    }
+
+    Ok(())
+}
+
+// Echo the cycle part by part through one stdout lock instead of joining it into a new String
+fn echo_sentences(target: &str, parts: &[String]) {
+    let mut out = std::io::stdout().lock();
+    let _ = write!(out, "Sent to {}: ", target);
+    if let Some((last, rest)) = parts.split_last() {
+        for part in rest {
+            let _ = out.write_all(part.as_bytes());
         }
-        println!("Sent to {}: {}", gps_input_path, sentence.trim());
-        thread::sleep(Duration::from_secs(1));
+        let _ = writeln!(out, "{}", last.trim_end());
     }
+}
 
+// Write every part with one gathering write, finishing any short write part by part
+fn write_all_vectored<const N: usize>(file: &mut File, parts: &[String; N]) -> std::io::Result<()> {
+    // The slices live on the stack, so a cycle costs no allocation here
+    let slices = parts.each_ref().map(|part| IoSlice::new(part.as_bytes()));
+    let mut written = file.write_vectored(&slices)?;
+
+    for part in parts {
+        let bytes = part.as_bytes();
+        if written >= bytes.len() {
+            written -= bytes.len();
+            continue;
+        }
+        file.write_all(&bytes[written..])?;
+        written = 0;
+    }
     Ok(())
 }
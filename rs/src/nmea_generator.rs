@@ -1,9 +1,73 @@
-use chrono::Utc;
+use chrono::{Datelike, Timelike, Utc};
 use rand::{
     distributions::{Distribution, Uniform},
     rngs::ThreadRng,
-    thread_rng,
+    thread_rng, Rng,
 };
+use std::fmt::Write;
+
+// XOR of a fixed sentence fragment, evaluated at compile time
+const fn xor_of(fragment: &[u8]) -> u8 {
+    let mut result = 0;
+    let mut i = 0;
+    while i < fragment.len() {
+        result ^= fragment[i];
+        i += 1;
+    }
+    result
+}
+
+// Sentence address with its checksum contribution precomputed
+struct SentenceTag {
+    text: &'static str,
+    checksum: u8,
+}
+
+impl SentenceTag {
+    const fn new(text: &'static str) -> Self {
+        SentenceTag {
+            text,
+            checksum: xor_of(text.as_bytes()),
+        }
+    }
+}
+
+const GPGGA_TAG: SentenceTag = SentenceTag::new("GPGGA,");
+const GPRMC_TAG: SentenceTag = SentenceTag::new("GPRMC,");
+const GPGLL_TAG: SentenceTag = SentenceTag::new("GPGLL,");
+const GPGSV_TAG: SentenceTag = SentenceTag::new("GPGSV,");
+
+// GSA tags indexed in the same order as the constellations are grouped. The constant
+// mode (A, automatic) and fix type (3, 3D) fields are folded into the tag
+const GSA_TAGS: [SentenceTag; 5] = [
+    SentenceTag::new("GPGSA,A,3,"),
+    SentenceTag::new("GLGSA,A,3,"),
+    SentenceTag::new("GAGSA,A,3,"),
+    SentenceTag::new("GBGSA,A,3,"),
+    SentenceTag::new("GQGSA,A,3,"),
+];
+
+// Uppercase hex digits for the checksum field
+const HEX_DIGITS: &[u8; 16] = b"0123456789ABCDEF";
+
+// XOR checksum over raw sentence bytes, starting from a precomputed seed
+#[inline]
+fn calculate_checksum(sentence: &[u8], seed: u8) -> u8 {
+    // XOR eight bytes at a time, then fold the word down to a single byte
+    let mut words = sentence.chunks_exact(8);
+    let mut word_checksum = words.by_ref().fold(seed as u64, |acc, word| {
+        acc ^ u64::from_ne_bytes(word.try_into().unwrap())
+    });
+    word_checksum ^= word_checksum >> 32;
+    word_checksum ^= word_checksum >> 16;
+    word_checksum ^= word_checksum >> 8;
+
+    // XOR the remaining tail bytes
+    words
+        .remainder()
+        .iter()
+        .fold(word_checksum as u8, |acc, b| acc ^ b)
+}
 
 pub struct RandomGenerator {
     rng: ThreadRng,
@@ -15,8 +79,8 @@ impl RandomGenerator {
     }
 
     pub fn random_uniform(&mut self, min: f64, max: f64) -> f64 {
-        let range = Uniform::from(min..max);
-        range.sample(&mut self.rng)
+        // Scale a [0, 1) draw instead of building a Uniform for every call
+        min + (max - min) * self.rng.gen::<f64>()
     }
 
     pub fn random_int(&mut self, min: i32, max: i32) -> i32 {
@@ -75,15 +139,6 @@ impl Constellation {
             Constellation::QZSS => "QZSS".to_string(),
         }
     }
-    pub fn to_code(&self) -> String {
-        match self {
-            Constellation::GPS => "GP".to_string(),
-            Constellation::GLONASS => "GL".to_string(),
-            Constellation::GALILEO => "GA".to_string(),
-            Constellation::BEIDOU => "GB".to_string(),
-            Constellation::QZSS => "GQ".to_string(),
-        }
-    }
 
     pub fn len() -> usize {
         5 // Number of constellations
@@ -111,6 +166,12 @@ pub struct LocationData {
     pub ew: char,
 }
 
+// UTC time and date fields shared by every sentence in one cycle
+pub struct UtcTimestamp {
+    pub time: String,
+    pub date: String,
+}
+
 pub struct NmeaGenerator {
     rg: RandomGenerator,
 }
@@ -141,39 +202,44 @@ impl NmeaGenerator {
         }
     }
 
-    fn get_utc_time(&self) -> String {
+    fn get_utc_timestamp(&self) -> UtcTimestamp {
+        // Read the clock once per cycle and format the fields from integers instead of a strftime pattern
         let now = Utc::now();
-        now.format("%H%M%S").to_string()
-    }
-
-    fn get_utc_date(&self) -> String {
-        let now = Utc::now();
-        now.format("%d%m%y").to_string()
-    }
-
-    fn calculate_checksum(&self, sentence: &str) -> String {
-        let mut checksum: u8 = 0;
-        for c in sentence.as_bytes() {
-            checksum ^= c;
+        UtcTimestamp {
+            time: format!("{:02}{:02}{:02}", now.hour(), now.minute(), now.second()),
+            date: format!("{:02}{:02}{:02}", now.day(), now.month(), now.year() % 100),
         }
-
-        format!("{:02X}", checksum)
     }
 
-    fn complete_sentence(&self, sentence: &str) -> String {
-        format!("${}*{}\r\n", sentence, self.calculate_checksum(sentence))
+    fn complete_sentence(&self, tag: &SentenceTag, fields: &str) -> String {
+        // Frame the sentence into one wire-ready buffer; the writer sends its bytes as-is.
+        // The tag's XOR is precomputed, so only the variable fields are hashed here
+        let checksum = calculate_checksum(fields.as_bytes(), tag.checksum);
+        let mut complete = String::with_capacity(tag.text.len() + fields.len() + 6);
+        complete.push('$');
+        complete.push_str(tag.text);
+        complete.push_str(fields);
+        complete.push('*');
+        complete.push(HEX_DIGITS[(checksum >> 4) as usize] as char);
+        complete.push(HEX_DIGITS[(checksum & 0x0F) as usize] as char);
+        complete.push_str("\r\n");
+        complete
     }
 
-    fn generate_gga(&mut self, loc: &LocationData, num_satellites: i32) -> String {
-        let utc_time = self.get_utc_time();
+    fn generate_gga(
+        &mut self,
+        loc: &LocationData,
+        utc: &UtcTimestamp,
+        num_satellites: i32,
+    ) -> String {
         let fix_quality = self.rg.random_int(0, 5);
         let altitude = self.rg.random_uniform(0.0, 1000.0);
         let hdop = self.rg.random_uniform(0.5, 10.0);
         let geoid_height = self.rg.random_uniform(-100.0, 100.0);
 
         let sentence = format!(
-            "GPGGA,{},{},{},{},{},{},{},{:.1},{:.1},M,{:.1},M,,",
-            utc_time,
+            "{},{},{},{},{},{},{},{:.1},{:.1},M,{:.1},M,,",
+            utc.time,
             loc.latitude,
             loc.ns,
             loc.longitude,
@@ -185,43 +251,31 @@ impl NmeaGenerator {
             geoid_height
         );
 
-        self.complete_sentence(&sentence)
+        self.complete_sentence(&GPGGA_TAG, &sentence)
     }
 
-    fn generate_rmc(&mut self, loc: &LocationData) -> String {
-        let utc_time = self.get_utc_time();
-        let status = 'A';
-        let latitude = format!("{}{}", loc.latitude, loc.ns);
-        let longitude = format!("{}{}", loc.longitude, loc.ew);
+    fn generate_rmc(&mut self, loc: &LocationData, utc: &UtcTimestamp) -> String {
         let speed = self.rg.random_uniform(0.0, 100.0);
         let course = self.rg.random_uniform(0.0, 360.0);
-        let utc_date = self.get_utc_date();
 
         let sentence = format!(
-            "GPRMC,{},{},{},{},{},{:.1},{:.1},{},{},,,",
-            utc_time, status, latitude, loc.ns, longitude, loc.ew, speed, course, utc_date
+            "{},A,{},{},{},{},{:.1},{:.1},{},,,",
+            utc.time, loc.latitude, loc.ns, loc.longitude, loc.ew, speed, course, utc.date
         );
 
-        self.complete_sentence(&sentence)
+        self.complete_sentence(&GPRMC_TAG, &sentence)
     }
 
-    fn generate_gll(&mut self, loc: &LocationData) -> String {
-        let latitude = format!("{}{}", loc.latitude, loc.ns);
-        let longitude = format!("{}{}", loc.longitude, loc.ew);
-        let utc_time = self.get_utc_time();
-        let status = 'A';
-
+    fn generate_gll(&mut self, loc: &LocationData, utc: &UtcTimestamp) -> String {
         let sentence = format!(
-            "GPGLL,{},{},{},{},{},{}",
-            latitude, loc.ns, longitude, loc.ew, utc_time, status
+            "{},{},{},{},{},A",
+            loc.latitude, loc.ns, loc.longitude, loc.ew, utc.time
         );
 
-        self.complete_sentence(&sentence)
+        self.complete_sentence(&GPGLL_TAG, &sentence)
     }
 
     fn generate_gsa(&mut self, satellites: &Vec<Satellite>) -> String {
-        let mode = 'A';
-        let fix_type = 3;
         let mut msgs = Vec::new();
 
         let pdop = self.rg.random_uniform(0.5, 10.0);
@@ -247,7 +301,6 @@ impl NmeaGenerator {
                 continue;
             }
 
-            let constell = constellations[0].constellation.to_code();
             let sats_str = constellations
                 .iter()
                 .map(|sat| sat.id.to_string())
@@ -261,20 +314,17 @@ impl NmeaGenerator {
             }
 
             let sentence = format!(
-                "{constell}GSA,{mode},{fix_type},{sats_str_padded},{pdop:.1},{hdop:.1},{vdop:.1}",
-                constell = constell,
-                mode = mode,
-                fix_type = fix_type,
+                "{sats_str_padded},{pdop:.1},{hdop:.1},{vdop:.1}",
                 sats_str_padded = sats_str_padded,
                 pdop = pdop,
                 hdop = hdop,
                 vdop = vdop
             );
 
-            msgs.push(self.complete_sentence(&sentence));
+            msgs.push(self.complete_sentence(&GSA_TAGS[i], &sentence));
         }
 
-        msgs.join("")
+        msgs.concat()
     }
 
     fn generate_gsv(&mut self, satellites: &[Satellite]) -> String {
@@ -290,28 +340,23 @@ impl NmeaGenerator {
             };
             let sats = &satellites[start..end];
 
-            let num_sats = sats.len();
-            let num_sats_str = num_sats.to_string();
-            let msg_num = (i + 1).to_string();
-            let total_msgs = num_msgs.to_string();
-
             let mut sats_str = String::new();
             for sat in sats {
-                sats_str.push_str(&format!("{},{},{},", sat.id, 0, 0)); // Elevation and Azimuth set to 0 for simplicity
+                let _ = write!(sats_str, "{},{},{},", sat.id, 0, 0); // Elevation and Azimuth set to 0 for simplicity
             }
 
             let sentence = format!(
-                "GPGSV,{total_msgs},{msg_num},{num_sats_str},{sats_str}",
-                total_msgs = total_msgs,
-                msg_num = msg_num,
-                num_sats_str = num_sats_str,
+                "{total_msgs},{msg_num},{num_sats},{sats_str}",
+                total_msgs = num_msgs,
+                msg_num = i + 1,
+                num_sats = sats.len(),
                 sats_str = sats_str
             );
 
-            msgs.push(self.complete_sentence(&sentence));
+            msgs.push(self.complete_sentence(&GPGSV_TAG, &sentence));
         }
 
-        msgs.join("")
+        msgs.concat()
     }
 
     fn generate_satellites(&mut self) -> Vec<Satellite> {
@@ -324,18 +369,19 @@ impl NmeaGenerator {
         satellites
     }
 
-    pub fn generate_sentences(&mut self) -> String {
+    // One buffer per sentence group, so the writer can gather them without joining
+    pub fn generate_sentences(&mut self) -> [String; 5] {
         let loc = self.generate_location();
         let active_satellites = self.generate_satellites();
         let num_satellites = active_satellites.len() as i32;
-
-        let mut sentences = String::new();
-        sentences.push_str(&self.generate_rmc(&loc));
-        sentences.push_str(&self.generate_gga(&loc, num_satellites));
-        sentences.push_str(&self.generate_gll(&loc));
-        sentences.push_str(&self.generate_gsa(&active_satellites));
-        sentences.push_str(&self.generate_gsv(&active_satellites));
-
-        sentences
+        let utc = self.get_utc_timestamp();
+
+        [
+            self.generate_rmc(&loc, &utc),
+            self.generate_gga(&loc, &utc, num_satellites),
+            self.generate_gll(&loc, &utc),
+            self.generate_gsa(&active_satellites),
+            self.generate_gsv(&active_satellites),
+        ]
     }
 }